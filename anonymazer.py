@@ -1,15 +1,19 @@
+import os
 import threading
 import time
-import urllib.request
-import subprocess
-import json
 import logging
 import random
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Callable, Tuple, List
-import psutil
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, FIRST_EXCEPTION
+from typing import Callable, Tuple, List, Mapping, Optional, TypeVar
 import socket
+import requests
+from requests.adapters import HTTPAdapter
+import dns.exception
+import dns.resolver
+
+T = TypeVar("T")
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,13 +29,54 @@ ALLOWED_PROTOCOLS = ["tcp"]
 CHECK_INTERVAL_BASE = 30
 CHECK_INTERVAL_MAX = 120
 CPU_THRESHOLD = 0.8
-MAX_RETRIES = 3
-RETRY_DELAY = 5
+RETRY_BUDGET = 20.0
+RETRY_BACKOFF_INITIAL = 1.0
+RETRY_MIN_ATTEMPT_TIME = 1.0
+NETWORK_TIMEOUT = 10
+TOR_STATUS_CACHE_TTL = 15
+IP_ANONYMITY_CACHE_TTL = 30
+IP_CHECK_HOST = "api.ipify.org"
+IP_CHECK_URL = f"https://{IP_CHECK_HOST}"
+IP_CHECK_PIN_REFRESH = 600
+PROC_NET_TCP_FILES = ["/proc/net/tcp", "/proc/net/tcp6"]
+TCP_LISTEN_STATE = "0A"
+KILL_SWITCH_RULESET = (
+    "*filter\n"
+    ":INPUT DROP [0:0]\n"
+    ":FORWARD DROP [0:0]\n"
+    ":OUTPUT DROP [0:0]\n"
+    "COMMIT\n"
+)
 FALLBACK_TOR_CHECK_URLS = [
     "https://check.torproject.org/api/ip",
     "https://api.onionoo.torproject.org/details?type=client",
 ]
 
+class SecurityBreach(Exception):
+    """Raised by a wrapped security check that reported a failure."""
+
+    def __init__(self, check_name: str, error_msg: str):
+        super().__init__(f"{check_name} failed - {error_msg}")
+        self.check_name = check_name
+        self.error_msg = error_msg
+
+
+class PinnedHostAdapter(HTTPAdapter):
+    """HTTPS adapter that keeps SNI and certificate checks on a fixed hostname.
+
+    Lets requests be sent to a pre-resolved IP literal with a Host header.
+    """
+
+    def __init__(self, hostname: str, **kwargs):
+        self.hostname = hostname
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["server_hostname"] = self.hostname
+        kwargs["assert_hostname"] = self.hostname
+        super().init_poolmanager(*args, **kwargs)
+
+
 class Anonymizer:
     def __init__(self):
         self.original_configs = {}
@@ -39,25 +84,82 @@ class Anonymizer:
         self.is_active = False
         self.tor_thread = None
         self.kill_switch_active = False
+        # Set by deactivate() to wake the monitor loop out of any wait
+        self._stop_event = threading.Event()
         self.network_interfaces = self.get_network_interfaces()
         
-        # Thread pool for concurrent checks
-        self.executor = ThreadPoolExecutor(max_workers=3)
+        # Checks run concurrently on every monitoring iteration. The monitor has its
+        # own freshness gate, so it calls the uncached probes to never skip a check.
+        self._checks: List[Tuple[Callable[[], Tuple[bool, str]], str]] = [
+            (self._probe_tor_status, "tor_status"),
+            (self.check_dns_leaks, "dns_leak"),
+            (self._probe_ip_anonymity, "ip_anonymity"),
+            (self.check_unauthorized_traffic, "unauthorized_traffic")
+        ]
+        
+        # Thread pool for concurrent checks, one worker per check so none queue
+        self.executor = ThreadPoolExecutor(max_workers=len(self._checks))
+        # Separate pool for network probes issued from inside checks so they never
+        # queue behind (or deadlock on) the checks themselves
+        self._probe_executor = ThreadPoolExecutor(max_workers=len(FALLBACK_TOR_CHECK_URLS) + 2)
+        
+        # Persistent Tor session so SOCKS/TLS connections are reused across polls
+        self._tor_session = requests.Session()
+        self._tor_session.proxies = {
+            "http": f"socks5h://127.0.0.1:{TOR_PORT}",
+            "https": f"socks5h://127.0.0.1:{TOR_PORT}"
+        }
+        self._tor_session.headers["User-Agent"] = "curl/7.68.0"
+        tor_adapter = HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=0)
+        self._tor_session.mount("http://", tor_adapter)
+        self._tor_session.mount("https://", tor_adapter)
+        
+        # Direct (non-Tor) session used only to learn the real IP for comparison.
+        # Requests go to a pinned IP, so TLS is verified against the real hostname.
+        self._plain_session = requests.Session()
+        self._plain_session.mount("https://", PinnedHostAdapter(IP_CHECK_HOST))
+        self._ip_check_pinned_ip = None
+        self._ip_check_pinned_at = float("-inf")
         
-        # Cache with thread lock for safety
-        self.cache_lock = threading.Lock()
-        self.last_check_results = {
+        # Immutable results snapshot, republished by a single attribute rebind
+        # so readers never need a lock
+        self._results_snapshot = MappingProxyType({
             "tor_status": None,
             "dns_leak": None,
             "ip_anonymity": None,
             "unauthorized_traffic": None,
             "last_check_time": 0
-        }
+        })
+        
+        # In-process resolver pointed at Tor's DNS port
+        self._dns_resolver = dns.resolver.Resolver(configure=False)
+        self._dns_resolver.nameservers = ["127.0.0.1"]
+        self._dns_resolver.port = TOR_DNS_PORT
+        self._dns_resolver.lifetime = NETWORK_TIMEOUT
+        
+        # /proc/net representations of the addresses and ports the traffic check allows
+        self._loopback_hex = {self._encode_proc_ip("127.0.0.1"), self._encode_proc_ip("::1")}
+        self._tor_port_hex = {f"{TOR_PORT:04X}", f"{TOR_DNS_PORT:04X}"}
+        
+        # Per-URL (etag, last_modified, is_tor) for conditional Tor check requests
+        self._tor_check_validators = {}
+        
+        # Short-lived (timestamp, result) caches for network-bound checks
+        self._tor_status_cache = (0, None)
+        self._ip_anonymity_cache = (0, None)
+        
+        # Consecutive fully-passing iterations, used to back off polling
+        self._consecutive_success = 0
         
         # Cache CPU reading to avoid blocking
         self.last_cpu_load = 0.0
         self.last_cpu_check = 0
         
+    @property
+    def last_check_results(self) -> Mapping[str, object]:
+        """Read-only view of the most recent check results."""
+        return self._results_snapshot
+
     def generate_encryption_key(self):
         """Placeholder for key generation."""
         return "dummy_key"
@@ -66,223 +168,380 @@ class Anonymizer:
         """Placeholder for network interface detection."""
         return []
 
-    def check_system_load(self) -> float:
+    def check_system_load(self, now: Optional[float] = None) -> float:
         """Get current CPU usage with caching to avoid blocking."""
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         # Cache CPU reading for 5 seconds
         if current_time - self.last_cpu_check < 5:
             return self.last_cpu_load
         
-        # Non-blocking CPU check
-        self.last_cpu_load = psutil.cpu_percent(interval=0) / 100
+        # 1-minute load average normalised per CPU (no /proc/stat parsing)
+        load_avg = os.getloadavg()[0]
+        self.last_cpu_load = min(1.0, load_avg / (os.cpu_count() or 1))
         self.last_cpu_check = current_time
         return self.last_cpu_load
 
-    def get_adaptive_interval(self) -> float:
-        """Adjust check interval based on system load."""
-        cpu_load = self.check_system_load()
+    def get_adaptive_interval(self, now: Optional[float] = None) -> float:
+        """Adjust check interval based on recent successes and system load."""
+        # Back off exponentially while checks keep passing
+        base = min(CHECK_INTERVAL_BASE * (2 ** min(self._consecutive_success, 4)), CHECK_INTERVAL_MAX)
+        cpu_load = self.check_system_load(now)
         if cpu_load > CPU_THRESHOLD:
-            return min(CHECK_INTERVAL_BASE * (1 + cpu_load), CHECK_INTERVAL_MAX)
-        return CHECK_INTERVAL_BASE
+            return min(base * (1 + cpu_load), CHECK_INTERVAL_MAX)
+        return base
 
     def check_tor_status(self, retry_count: int = 0) -> Tuple[bool, str]:
-        """Verify Tor is running with fallback URLs and proper retries."""
+        """Verify Tor is running, reusing a recent result when available."""
+        cached_time, cached_result = self._tor_status_cache
+        if retry_count == 0 and cached_result is not None:
+            if time.time() - cached_time < TOR_STATUS_CACHE_TTL:
+                return cached_result
+        
+        result = self._probe_tor_status()
+        self._tor_status_cache = (time.time(), result)
+        return result
+
+    def _probe_tor_status(self) -> Tuple[bool, str]:
+        """Query all fallback Tor check URLs concurrently, first definitive answer wins."""
+        pending = {self._probe_executor.submit(self._probe_one_tor_url, url)
+                   for url in FALLBACK_TOR_CHECK_URLS}
         last_error = ""
         
-        for url in FALLBACK_TOR_CHECK_URLS:
-            for attempt in range(MAX_RETRIES):
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
                 try:
-                    # Use Tor proxy for the check itself
-                    proxy = urllib.request.ProxyHandler({
-                        'http': f'socks5h://127.0.0.1:{TOR_PORT}',
-                        'https': f'socks5h://127.0.0.1:{TOR_PORT}'
-                    })
-                    opener = urllib.request.build_opener(proxy)
-                    request = urllib.request.Request(url, headers={"User-Agent": "curl/7.68.0"})
-                    
-                    with opener.open(request, timeout=10) as response:
-                        data = json.loads(response.read().decode())
-                        
-                        if "IsTor" in data:
-                            is_tor = data["IsTor"]
-                        elif "clients" in data:
-                            is_tor = bool(data.get("clients"))
-                        else:
-                            continue
-                            
-                        if is_tor:
-                            return True, ""
-                        return False, f"Tor not active at {url}"
-                        
+                    is_tor, error_msg = future.result()
                 except Exception as e:
-                    last_error = f"{url}: {str(e)}"
-                    if attempt < MAX_RETRIES - 1:
-                        time.sleep(RETRY_DELAY)
+                    is_tor, error_msg = None, str(e)
+                    
+                # Unreachable or unparseable endpoint: fall through to the others
+                if is_tor is None:
+                    last_error = error_msg
                     continue
                     
+                for other in pending:
+                    other.cancel()
+                if is_tor:
+                    return True, ""
+                return False, error_msg
+                
         return False, f"All Tor checks failed. Last error: {last_error}"
 
-    def check_dns_leaks(self, retry_count: int = 0) -> Tuple[bool, str]:
-        """Verify DNS queries go through Tor."""
-        for attempt in range(MAX_RETRIES):
-            try:
-                # Use a real domain that should resolve
-                test_domain = "check.torproject.org"
-                
-                # Check DNS resolution through Tor
-                result = subprocess.run(
-                    ["dig", "+short", "@127.0.0.1", "-p", str(TOR_DNS_PORT), test_domain],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                    check=True
-                )
-                
-                # Verify we got a response
-                if result.stdout.strip():
-                    return True, ""
-                    
-                return False, "DNS resolution through Tor failed"
+    def _probe_one_tor_url(self, url: str) -> Tuple[Optional[bool], str]:
+        """Check a single Tor check URL, retrying within the time budget.
+        
+        Returns (None, error) when the endpoint could not give an answer.
+        """
+        def attempt(remaining: float) -> Optional[bool]:
+            # Conditional GET: skip the body and JSON parse when the response is unchanged
+            etag, last_modified, cached_is_tor = self._tor_check_validators.get(url, (None, None, None))
+            headers = {}
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
                 
-            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                    continue
-                return False, f"DNS leak check failed: {str(e)}"
+            # Reuse the pooled Tor session for the check itself
+            response = self._tor_session.get(url, headers=headers,
+                                             timeout=self._request_timeout(remaining))
+            if response.status_code == 304 and cached_is_tor is not None:
+                return cached_is_tor
+            data = response.json()
+            
+            if "IsTor" in data:
+                is_tor = data["IsTor"]
+            elif "clients" in data:
+                is_tor = bool(data.get("clients"))
+            else:
+                # Unrecognised response shape: retrying would not change it
+                return None
                 
-        return False, "DNS leak check exhausted retries"
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                self._tor_check_validators[url] = (etag, last_modified, is_tor)
+            return is_tor
+            
+        try:
+            is_tor = self._retry_with_budget(attempt, (requests.RequestException, ValueError))
+        except (requests.RequestException, ValueError) as e:
+            return None, f"{url}: {str(e)}"
+            
+        if is_tor is None:
+            return None, f"{url}: unexpected response"
+        if is_tor:
+            return True, ""
+        return False, f"Tor not active at {url}"
+
+    def check_dns_leaks(self, retry_count: int = 0) -> Tuple[bool, str]:
+        """Verify DNS queries go through Tor."""
+        # Use a real domain that should resolve
+        test_domain = "check.torproject.org"
+        
+        try:
+            # Check DNS resolution through Tor, retrying only transport-level errors
+            self._retry_with_budget(
+                lambda remaining: self._dns_resolver.resolve(
+                    test_domain, "A", lifetime=min(NETWORK_TIMEOUT, remaining)
+                ),
+                (dns.exception.Timeout, dns.resolver.NoNameservers)
+            )
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            # Definitive answer without an address: fail at once
+            return False, "DNS resolution through Tor failed"
+        except dns.exception.DNSException as e:
+            return False, f"DNS leak check failed: {str(e)}"
+            
+        return True, ""
 
     def check_ip_anonymity(self, retry_count: int = 0) -> Tuple[bool, str]:
-        """Verify external IP differs from real IP."""
-        for attempt in range(MAX_RETRIES):
+        """Verify external IP differs from real IP, reusing a recent result when available."""
+        cached_time, cached_result = self._ip_anonymity_cache
+        if retry_count == 0 and cached_result is not None:
+            if time.time() - cached_time < IP_ANONYMITY_CACHE_TTL:
+                return cached_result
+        
+        result = self._probe_ip_anonymity()
+        self._ip_anonymity_cache = (time.time(), result)
+        return result
+
+    def _probe_ip_anonymity(self) -> Tuple[bool, str]:
+        """Compare the public IP seen through Tor with the real one."""
+        def attempt(remaining: float) -> Tuple[str, str]:
+            # Fetch Tor IP and real IP concurrently
+            # (the real IP request could leak, but is necessary for comparison)
+            timeout = self._request_timeout(remaining)
+            tor_future = self._probe_executor.submit(
+                self._fetch_public_ip, self._tor_session, IP_CHECK_URL, timeout
+            )
+            real_future = self._probe_executor.submit(
+                self._fetch_public_ip, self._plain_session, self._pinned_ip_check_url(), timeout
+            )
+            return tor_future.result(), real_future.result()
+            
+        try:
+            tor_ip, real_ip = self._retry_with_budget(attempt, (requests.RequestException,))
+        except requests.RequestException as e:
+            return False, f"IP check failed: {str(e)}"
+            
+        if real_ip and tor_ip and real_ip != tor_ip:
+            return True, ""
+            
+        return False, f"IPs match or invalid: real={real_ip}, tor={tor_ip}"
+
+    def _pinned_ip_check_url(self) -> str:
+        """Return the IP check URL on a periodically re-resolved IP literal.
+        
+        Only used for the clearnet request; the Tor request keeps remote DNS.
+        """
+        if time.monotonic() - self._ip_check_pinned_at > IP_CHECK_PIN_REFRESH:
             try:
-                # Get Tor IP first (safer order)
-                tor_result = subprocess.run(
-                    ["curl", "--socks5-hostname", f"127.0.0.1:{TOR_PORT}", 
-                     "-s", "-m", "10", "https://api.ipify.org"],
-                    capture_output=True,
-                    text=True,
-                    timeout=15,
-                    check=True
-                )
-                tor_ip = tor_result.stdout.strip()
-                
-                # Get real IP (this could leak, but necessary for comparison)
-                real_result = subprocess.run(
-                    ["curl", "-s", "-m", "10", "https://api.ipify.org"],
-                    capture_output=True,
-                    text=True,
-                    timeout=15,
-                    check=True
-                )
-                real_ip = real_result.stdout.strip()
-                
-                if real_ip and tor_ip and real_ip != tor_ip:
-                    return True, ""
-                    
-                return False, f"IPs match or invalid: real={real_ip}, tor={tor_ip}"
-                
-            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(RETRY_DELAY)
-                    continue
-                return False, f"IP check failed: {str(e)}"
+                self._ip_check_pinned_ip = socket.gethostbyname(IP_CHECK_HOST)
+                self._ip_check_pinned_at = time.monotonic()
+            except OSError as e:
+                # Keep any previous pin and try resolving again on the next call
+                logger.warning(f"Could not resolve {IP_CHECK_HOST}: {e}")
                 
-        return False, "IP anonymity check exhausted retries"
+        if self._ip_check_pinned_ip is None:
+            return IP_CHECK_URL
+        return f"https://{self._ip_check_pinned_ip}"
+
+    def _fetch_public_ip(self, session: requests.Session, url: str = IP_CHECK_URL,
+                         timeout: Tuple[float, float] = (NETWORK_TIMEOUT, NETWORK_TIMEOUT)) -> str:
+        """Return the public IP address as seen through the given session."""
+        response = session.get(url, headers={"Host": IP_CHECK_HOST}, timeout=timeout)
+        response.raise_for_status()
+        return response.text.strip()
+
+    @staticmethod
+    def _request_timeout(remaining: float) -> Tuple[float, float]:
+        """Split the remaining budget into (connect, read) timeouts for requests."""
+        phase_timeout = min(NETWORK_TIMEOUT, remaining / 2)
+        return phase_timeout, phase_timeout
+
+    def _retry_with_budget(self, fn: Callable[[float], T], retry_on: Tuple[type, ...],
+                           budget: float = RETRY_BUDGET) -> T:
+        """Call fn, retrying with exponential backoff until the time budget runs out.
+        
+        fn receives the remaining budget in seconds and must bound its own
+        timeouts by it, so no attempt runs past the deadline. The last exception
+        is re-raised when there is no time left for another attempt.
+        """
+        deadline = time.monotonic() + budget
+        backoff = RETRY_BACKOFF_INITIAL
+        while True:
+            try:
+                return fn(deadline - time.monotonic())
+            except retry_on:
+                remaining = deadline - time.monotonic() - backoff
+                if remaining < RETRY_MIN_ATTEMPT_TIME:
+                    raise
+                time.sleep(backoff)
+                backoff *= 2
 
     def check_unauthorized_traffic(self) -> Tuple[bool, str]:
-        """Check for non-Tor traffic using netstat."""
+        """Check for non-Tor listening sockets using /proc/net, or psutil without procfs."""
         try:
-            result = subprocess.run(
-                ["netstat", "-tuln"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-                check=True
-            )
+            if os.path.exists(PROC_NET_TCP_FILES[0]):
+                suspicious = self._listening_non_local()
+            else:
+                suspicious = self._listening_non_local_psutil()
+        except Exception as e:
+            return False, f"Traffic check failed: {str(e)}"
             
-            suspicious_lines = []
-            for line in result.stdout.splitlines():
-                # Check for listening ports that aren't localhost or Tor
-                if "LISTEN" in line:
-                    if "127.0.0.1" not in line and "::1" not in line:
-                        if str(TOR_PORT) not in line and str(TOR_DNS_PORT) not in line:
-                            suspicious_lines.append(line.strip())
+        if suspicious:
+            return False, f"Suspicious traffic: {suspicious[0]}"
             
-            if suspicious_lines:
-                return False, f"Suspicious traffic: {suspicious_lines[0]}"
+        return True, ""
+
+    def _listening_non_local(self) -> List[str]:
+        """List non-loopback, non-Tor listening TCP sockets from /proc/net/tcp{,6}."""
+        suspicious = []
+        for path in PROC_NET_TCP_FILES:
+            try:
+                with open(path) as f:
+                    lines = f.read().splitlines()[1:]  # Skip header
+            except FileNotFoundError:
+                # /proc/net/tcp6 is absent when IPv6 is disabled; /proc/net/tcp must exist
+                if path == PROC_NET_TCP_FILES[0]:
+                    raise
+                continue
                 
-            return True, ""
-            
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
-            return False, f"Traffic check failed: {str(e)}"
+                
+            for line in lines:
+                # Only the first four columns are needed: sl, local, remote, state
+                fields = line.split(None, 4)
+                if len(fields) < 4 or fields[3] != TCP_LISTEN_STATE:
+                    continue
+                    
+                # Compare raw hex against precomputed values; decode only what gets reported
+                hex_ip, hex_port = fields[1].split(":")
+                if hex_ip in self._loopback_hex or hex_port in self._tor_port_hex:
+                    continue
+                suspicious.append(f"{path} {self._decode_proc_ip(hex_ip)}:{int(hex_port, 16)} LISTEN")
+                
+        return suspicious
+
+    def _listening_non_local_psutil(self) -> List[str]:
+        """List non-loopback, non-Tor listening TCP sockets via psutil (no procfs)."""
+        import psutil  # Optional: only needed on platforms without /proc/net
+        
+        return [f"{conn.laddr.ip}:{conn.laddr.port} LISTEN"
+                for conn in psutil.net_connections(kind="inet")
+                if conn.status == psutil.CONN_LISTEN
+                and conn.laddr.ip not in ("127.0.0.1", "::1")
+                and conn.laddr.port not in (TOR_PORT, TOR_DNS_PORT)]
+
+    @staticmethod
+    def _encode_proc_ip(ip: str) -> str:
+        """Encode an address the way /proc/net prints it (host-order 32-bit hex words)."""
+        family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+        packed = socket.inet_pton(family, ip)
+        return "".join(f"{int.from_bytes(packed[i:i + 4], sys.byteorder):08X}"
+                       for i in range(0, len(packed), 4))
+
+    @staticmethod
+    def _decode_proc_ip(hex_ip: str) -> str:
+        """Decode a /proc/net address, stored as host-order 32-bit words."""
+        words = [int(hex_ip[i:i + 8], 16).to_bytes(4, sys.byteorder)
+                 for i in range(0, len(hex_ip), 8)]
+        packed = b"".join(words)
+        family = socket.AF_INET if len(packed) == 4 else socket.AF_INET6
+        return socket.inet_ntop(family, packed)
 
     def monitor_security(self):
         """Optimized continuous security monitoring."""
         logger.info("Security monitoring started")
         
         while self.is_active:
-            start_time = time.time()
-            interval = self.get_adaptive_interval()
-            
-            # Thread-safe cache check
-            with self.cache_lock:
-                time_since_check = time.time() - self.last_check_results["last_check_time"]
-                if time_since_check < (interval / 2):
-                    # Sleep and continue to next iteration
-                    time.sleep(min(interval / 4, 10))
-                    continue
+            # Single timestamp for the whole iteration
+            now = time.time()
+            interval = self.get_adaptive_interval(now)
             
-            # Define checks to run concurrently
-            checks: List[Tuple[Callable[[], Tuple[bool, str]], str]] = [
-                (self.check_tor_status, "tor_status"),
-                (self.check_dns_leaks, "dns_leak"),
-                (self.check_ip_anonymity, "ip_anonymity"),
-                (self.check_unauthorized_traffic, "unauthorized_traffic")
-            ]
+            # Lock-free cache check against the current snapshot
+            remaining = self._results_snapshot["last_check_time"] + interval / 2 - now
+            if remaining > 0:
+                # Wait exactly until results go stale, or until deactivated
+                if self._stop_event.wait(remaining):
+                    return
+                continue
             
             results = {}
             
             # FIX: Use self.executor directly, not as context manager
-            future_to_check = {self.executor.submit(check[0]): check[1] for check in checks}
+            future_to_check = {self.executor.submit(self._run_check, *check): check[1] for check in self._checks}
             
-            for future in as_completed(future_to_check):
+            # Return as soon as any check fails so the kill switch is not held up by slow checks
+            done, not_done = wait(future_to_check, timeout=30, return_when=FIRST_EXCEPTION)
+            
+            # Record every completed check, logging and evaluating in the same pass;
+            # logging stops at the first failure since the kill switch follows
+            all_passed = True
+            for future in done:
                 check_name = future_to_check[future]
                 try:
-                    success, error_msg = future.result(timeout=30)
-                    results[check_name] = (success, error_msg)
+                    results[check_name] = future.result()
+                except SecurityBreach as e:
+                    results[check_name] = (False, e.error_msg)
                 except Exception as e:
                     logger.error(f"Check {check_name} raised exception: {e}")
                     results[check_name] = (False, f"Exception: {str(e)}")
-            
-            # Update cache atomically
-            with self.cache_lock:
-                for check_name, (success, _) in results.items():
-                    self.last_check_results[check_name] = success
-                self.last_check_results["last_check_time"] = time.time()
-            
-            # Process results and trigger kill switch if needed
-            all_passed = True
-            for check_name, (success, error_msg) in results.items():
+                    
+                if not all_passed:
+                    continue
+                success, error_msg = results[check_name]
                 if not success:
                     logger.critical(f"SECURITY BREACH: {check_name} failed - {error_msg}")
                     all_passed = False
                 else:
                     logger.info(f"✓ {check_name} passed")
             
+            # If nothing failed, anything still pending ran out of time
+            timed_out = all_passed
+            for future in not_done:
+                future.cancel()
+                if timed_out:
+                    check_name = future_to_check[future]
+                    results[check_name] = (False, "Check timed out")
+                    logger.critical(f"SECURITY BREACH: {check_name} failed - Check timed out")
+                    all_passed = False
+            
+            # Publish a new snapshot (copy-on-write)
+            snapshot = dict(self._results_snapshot)
+            for check_name, (success, _) in results.items():
+                snapshot[check_name] = success
+            snapshot["last_check_time"] = now
+            self._results_snapshot = MappingProxyType(snapshot)
+            
+            if all_passed:
+                self._consecutive_success += 1
+            else:
+                self._consecutive_success = 0
+            
             if not all_passed:
                 logger.critical("Security checks failed - activating kill switch")
                 self.emergency_shutdown()
                 return
             
             # Sleep until next check with jitter
-            elapsed = time.time() - start_time
+            elapsed = time.time() - now
             sleep_time = max(0, interval - elapsed)
             jitter = random.uniform(0, min(5, sleep_time * 0.1))
-            time.sleep(sleep_time + jitter)
+            if self._stop_event.wait(sleep_time + jitter):
+                return
+
+    def _run_check(self, check: Callable[[], Tuple[bool, str]], check_name: str) -> Tuple[bool, str]:
+        """Run a check, raising SecurityBreach if it reports a failure."""
+        success, error_msg = check()
+        if not success:
+            raise SecurityBreach(check_name, error_msg)
+        return success, error_msg
 
     def emergency_shutdown(self):
         """Activate kill switch and block all traffic."""
+        import subprocess  # Only needed on the kill-switch path
+        
         if self.kill_switch_active:
             return  # Prevent multiple activations
             
@@ -292,14 +551,10 @@ class Anonymizer:
         logger.critical("=" * 60)
         
         try:
-            # Flush existing rules
-            subprocess.run(["iptables", "-F"], check=True, timeout=5)
-            subprocess.run(["ip6tables", "-F"], check=True, timeout=5)
-            
-            # Block all traffic
-            for cmd_base in [["iptables"], ["ip6tables"]]:
-                for chain in ["INPUT", "OUTPUT", "FORWARD"]:
-                    subprocess.run(cmd_base + ["-P", chain, "DROP"], check=True, timeout=5)
+            # Flush existing rules and block all traffic in one atomic transaction
+            for restore_cmd in ["iptables-restore", "ip6tables-restore"]:
+                subprocess.run([restore_cmd], input=KILL_SWITCH_RULESET, text=True,
+                               check=True, timeout=5)
             
             logger.critical("All network traffic blocked")
             self.restore_system()
@@ -317,10 +572,14 @@ class Anonymizer:
     def deactivate(self):
         """Deactivate and clean up."""
         logger.info("Deactivating anonymization system")
+        self._stop_event.set()
         self.is_active = False
         
         # Shutdown thread pool gracefully
         self.executor.shutdown(wait=True, cancel_futures=True)
+        self._probe_executor.shutdown(wait=True, cancel_futures=True)
+        self._tor_session.close()
+        self._plain_session.close()
         
         self.restore_system()
         logger.info("Anonymization system deactivated")
\ No newline at end of file